@@ -4,37 +4,70 @@ CrawlPrime FastAPI application.
 Provides:
   POST /ingest           — crawl a URL in the background; returns a job_id
   GET  /ingest/{job_id}  — poll ingest job status
+  GET  /ingest/{job_id}/stream — ingest job status as Server-Sent Events
   POST /query            — query indexed web content
   GET  /health           — health check
+  GET  /metrics          — Prometheus metrics (per-route latency histograms)
 
 Run with:
-  uvicorn crawl_prime.api:app --reload --port 8001
+  uvicorn crawl_prime.api:app --reload --port 8001     # development
+  python -m crawl_prime.serve --port 8001              # production (uvloop, httptools; see serve.py)
 """
 
 import asyncio
 import os
-import sys
 import uuid
 from contextlib import asynccontextmanager
-from pathlib import Path
-
-# Dev-mode fallback: if contextprime is not installed as a package,
-# add the sibling doctags_rag directory to sys.path.
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
-
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from prometheus_fastapi_instrumentator import Instrumentator
 from pydantic import BaseModel
 
+from .jobs import create_job_store
 from .pipeline import CrawlPrimePipeline
 
 
+# ── Ingest de-duplication ────────────────────────────────────────────────────
+
+class IngestDeduplicator:
+    """
+    Share one in-flight ingest of a URL between concurrent jobs.
+
+    A job for a URL that is already being crawled waits for that crawl's
+    report instead of starting a second one.  Concurrency across different
+    URLs is bounded by the pipeline's ``ingest_concurrency``.
+    """
+
+    def __init__(self, pipeline: CrawlPrimePipeline):
+        self._pipeline = pipeline
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, url: str):
+        """Ingest ``url``, or join the ingest already running for it."""
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._pipeline.ingest(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._forget(url, task))
+        # Shielded so one cancelled waiter does not cancel the shared crawl;
+        # if the crawl itself is cancelled, every waiter is cancelled too.
+        return await asyncio.shield(task)
+
+    def _forget(self, url: str, task: asyncio.Task) -> None:
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+
+    async def stop(self) -> None:
+        """Cancel every running ingest; their waiters see CancelledError."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 # ── Lifespan — create pipeline at startup, close cleanly at shutdown ────────
 
 @asynccontextmanager
@@ -48,16 +81,26 @@ async def lifespan(app: FastAPI):
       - Guarantees close() is called even if startup raises mid-way
       - Is safe across all uvicorn worker configurations
     """
-    app.state.pipeline = CrawlPrimePipeline(
+    # Construction opens Neo4j/Qdrant connections synchronously; run it in a
+    # worker thread so the event loop stays responsive during startup.
+    app.state.pipeline = await asyncio.to_thread(
+        CrawlPrimePipeline,
         neo4j_host=os.getenv("NEO4J_HOST", "localhost"),
         neo4j_port=int(os.getenv("NEO4J_PORT", "7687")),
         neo4j_user=os.getenv("NEO4J_USERNAME", "neo4j"),
         neo4j_password=os.getenv("NEO4J_PASSWORD", "password"),
         qdrant_host=os.getenv("QDRANT_HOST", "localhost"),
         qdrant_port=int(os.getenv("QDRANT_PORT", "6333")),
+        quantization=os.getenv("QDRANT_QUANTIZATION") or None,
+    )
+    app.state.jobs = create_job_store(
+        os.getenv("REDIS_URL"), ttl_seconds=_JOB_TTL_SECONDS
     )
+    app.state.ingests = IngestDeduplicator(app.state.pipeline)
     yield
-    app.state.pipeline.close()
+    await app.state.ingests.stop()
+    await app.state.jobs.close()
+    await app.state.pipeline.aclose()
 
 
 app = FastAPI(
@@ -66,15 +109,33 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
-
-# ── In-memory job store for background ingest tasks ─────────────────────────
-# Keyed by job_id (hex UUID).  In a multi-worker deployment this should be
-# replaced with a shared store (Redis, database, etc.).
+# Compress text-heavy JSON answers for clients that accept gzip.  Starlette
+# never compresses text/event-stream, so /ingest/{job_id}/stream still
+# flushes each frame immediately.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Per-route request latency histograms (P50/P95/P99 via histogram_quantile)
+# exposed at /metrics.  SSE streams stay open for the whole job, so their
+# duration would only skew the latency buckets.
+Instrumentator(
+    excluded_handlers=["/metrics", "/ingest/{job_id}/stream"],
+).instrument(app).expose(app, include_in_schema=False)
+
+# ── Job store for background ingest tasks ───────────────────────────────────
+# Keyed by job_id (hex UUID).  Set REDIS_URL to share jobs across workers;
+# otherwise jobs live in a bounded in-process cache (single worker only).
 # Entries are evicted automatically _JOB_TTL_SECONDS after they reach a
 # terminal state (done / error) to prevent unbounded growth.
 
-_jobs: Dict[str, dict] = {}
 _JOB_TTL_SECONDS = 3600  # 1 hour
+_TERMINAL_STATUSES = {"done", "error"}
+
+# Per-job change notifications for /ingest/{job_id}/stream.  Process-local:
+# a stream served by a worker that is not running the job falls back to
+# re-reading the (shared) job store every _SSE_REMOTE_POLL_SECONDS.
+_job_events: Dict[str, asyncio.Event] = {}
+_SSE_HEARTBEAT_SECONDS = 15
+_SSE_REMOTE_POLL_SECONDS = 1.0
 
 
 # ── Request / response models ────────────────────────────────────────────────
@@ -105,24 +166,66 @@ class QueryResponse(BaseModel):
 
 # ── Background ingest task ───────────────────────────────────────────────────
 
+def _notify_job(job_id: str, final: bool = False) -> None:
+    """Wake streams waiting on ``job_id``; arm a fresh event unless final."""
+    event = _job_events.pop(job_id, None)
+    if not final:
+        _job_events[job_id] = asyncio.Event()
+    if event is not None:
+        event.set()
+
+
 async def _run_ingest(job_id: str, url: str) -> None:
-    """Run pipeline.ingest() in the background and record the result."""
-    _jobs[job_id]["status"] = "running"
+    """Ingest ``url`` (sharing any ingest already running for it) and record the result."""
+    jobs = app.state.jobs
+    await jobs.update(job_id, status="running")
+    _notify_job(job_id)
     try:
-        pipeline: CrawlPrimePipeline = app.state.pipeline
-        report = await pipeline.ingest(url)
-        _jobs[job_id].update(
+        report = await app.state.ingests.submit(url)
+        await jobs.finish(
+            job_id,
             status="done",
             chunks_ingested=report.chunks_ingested,
             failed=report.failed_documents,
         )
     except Exception as exc:
-        _jobs[job_id].update(status="error", error=str(exc))
+        # finish() also starts the TTL so terminal entries are evicted.
+        await jobs.finish(job_id, status="error", error=str(exc))
     finally:
-        # Evict the job entry after TTL to prevent unbounded memory growth.
-        asyncio.get_running_loop().call_later(
-            _JOB_TTL_SECONDS, _jobs.pop, job_id, None
-        )
+        _notify_job(job_id, final=True)
+
+
+async def _job_event_stream(job_id: str) -> AsyncIterator[str]:
+    """Yield an SSE ``data:`` frame per status change until the job ends."""
+    loop = asyncio.get_running_loop()
+    last_job = None
+    last_sent = loop.time()
+    while True:
+        # Take the event before reading the job: a change that lands after
+        # the read (or while this generator is suspended at a yield) sets
+        # this event, so the wait below returns at once instead of missing it.
+        event = _job_events.get(job_id)
+        job = await app.state.jobs.get(job_id)
+        if job is None:
+            return  # evicted while streaming
+        if job != last_job:
+            frame = IngestJobResponse(job_id=job_id, **job).model_dump_json()
+            yield f"data: {frame}\n\n"
+            last_job, last_sent = job, loop.time()
+            if job["status"] in _TERMINAL_STATUSES:
+                return
+        elif loop.time() - last_sent >= _SSE_HEARTBEAT_SECONDS:
+            yield ": keep-alive\n\n"
+            last_sent = loop.time()
+
+        timeout = _SSE_HEARTBEAT_SECONDS if event else _SSE_REMOTE_POLL_SECONDS
+        try:
+            if event is not None:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            else:
+                await asyncio.sleep(timeout)
+        except asyncio.TimeoutError:
+            pass
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -139,13 +242,15 @@ async def ingest(
 ) -> IngestJobResponse:
     """
     Submit a URL for crawling and indexing.  Returns immediately with a
-    ``job_id``; poll ``GET /ingest/{job_id}`` to check progress.
+    ``job_id``; poll ``GET /ingest/{job_id}`` or subscribe to
+    ``GET /ingest/{job_id}/stream`` to follow progress.
 
     Crawling is offloaded to a background task to avoid proxy timeout
     (504) on large pages.
     """
     job_id = uuid.uuid4().hex
-    _jobs[job_id] = {"status": "pending", "url": request.url}
+    await app.state.jobs.create(job_id, status="pending", url=request.url)
+    _job_events[job_id] = asyncio.Event()
     background_tasks.add_task(_run_ingest, job_id, request.url)
     return IngestJobResponse(job_id=job_id, status="pending", url=request.url)
 
@@ -159,12 +264,33 @@ async def get_ingest_status(job_id: str) -> IngestJobResponse:
     """
     Poll the status of a background ingest job submitted via ``POST /ingest``.
     """
-    job = _jobs.get(job_id)
+    job = await app.state.jobs.get(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id!r} not found")
     return IngestJobResponse(job_id=job_id, **job)
 
 
+@app.get(
+    "/ingest/{job_id}/stream",
+    summary="Stream ingest job status (Server-Sent Events)",
+)
+async def stream_ingest_status(job_id: str) -> StreamingResponse:
+    """
+    Stream status changes of a background ingest job as ``text/event-stream``.
+
+    Each change is sent as a ``data:`` frame holding the same JSON as
+    ``GET /ingest/{job_id}``; the stream closes after the terminal state.
+    Comment-line heartbeats keep idle connections open through proxies.
+    """
+    if await app.state.jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id!r} not found")
+    return StreamingResponse(
+        _job_event_stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/query", response_model=QueryResponse, summary="Query indexed web content")
 async def query(request: QueryRequest) -> QueryResponse:
     """
@@ -0,0 +1,136 @@
+"""
+Ingest job stores for the CrawlPrime API.
+
+Provides:
+  InMemoryJobStore — bounded process-local cache; the default for one worker
+  RedisJobStore    — Redis hashes (``job:{job_id}``) shared by every worker
+
+Both expose the same async interface so ``api.py`` does not care which one
+is in use.  ``create_job_store()`` picks Redis when ``REDIS_URL`` is set.
+"""
+
+import json
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+
+class InMemoryJobStore:
+    """
+    Process-local job store.
+
+    Pending and running jobs live in one ``TTLCache`` with the long
+    ``inflight_ttl_seconds``, so a job queued or crawling for a long time is
+    not dropped mid-flight; ``finish()`` moves a job into a second cache that
+    evicts it ``ttl_seconds`` later.  Each cache holds at most ``max_jobs``
+    entries, the least recently written being dropped first.  Once a job has
+    been evicted, ``update()`` and ``finish()`` leave it gone.
+
+    Only suitable for a single uvicorn worker: a ``GET /ingest/{job_id}``
+    routed to a different worker will not see the job.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        inflight_ttl_seconds: int = 86_400,
+        max_jobs: int = 10_000,
+    ):
+        # All access happens on the event loop thread with no awaits between
+        # read and write, so the non-thread-safe caches need no lock.
+        self._inflight: TTLCache = TTLCache(maxsize=max_jobs, ttl=inflight_ttl_seconds)
+        self._finished: TTLCache = TTLCache(maxsize=max_jobs, ttl=ttl_seconds)
+
+    async def create(self, job_id: str, **fields) -> None:
+        self._inflight[job_id] = dict(fields)
+
+    async def update(self, job_id: str, **fields) -> None:
+        job = self._inflight.get(job_id)
+        if job is not None:
+            # Re-inserting restarts the in-flight TTL.
+            self._inflight[job_id] = {**job, **fields}
+
+    async def finish(self, job_id: str, **fields) -> None:
+        """Record a terminal state; the job is evicted after the TTL."""
+        job = self._inflight.pop(job_id, None)
+        if job is not None:
+            self._finished[job_id] = {**job, **fields}
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self._finished.get(job_id)
+        if job is None:
+            job = self._inflight.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def close(self) -> None:
+        self._inflight.clear()
+        self._finished.clear()
+
+
+class RedisJobStore:
+    """
+    Redis-backed job store shared across workers and restarts.
+
+    Each job is a hash at ``job:{job_id}``; field values are JSON-encoded so
+    lists (``failed``) and integers round-trip unchanged.  Every write also
+    sets a Redis ``EXPIRE``: ``inflight_ttl_seconds`` while the job is
+    pending or running, so a job orphaned by a crashed worker is eventually
+    deleted, and ``ttl_seconds`` once ``finish()`` records its final state.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: int,
+        inflight_ttl_seconds: int = 86_400,
+        max_connections: int = 32,
+    ):
+        import redis.asyncio as aioredis  # optional dependency: pip install crawlprime[redis]
+
+        self._redis = aioredis.from_url(
+            url, decode_responses=True, max_connections=max_connections
+        )
+        self._ttl_seconds = ttl_seconds
+        self._inflight_ttl_seconds = inflight_ttl_seconds
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _encode(fields: dict) -> Dict[str, str]:
+        return {name: json.dumps(value) for name, value in fields.items()}
+
+    async def _write(self, job_id: str, fields: dict, ttl_seconds: int) -> None:
+        """Set ``fields`` and (re)start the key's expiry in one transaction."""
+        key = self._key(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=self._encode(fields))
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+
+    async def create(self, job_id: str, **fields) -> None:
+        await self._write(job_id, fields, self._inflight_ttl_seconds)
+
+    async def update(self, job_id: str, **fields) -> None:
+        await self._write(job_id, fields, self._inflight_ttl_seconds)
+
+    async def finish(self, job_id: str, **fields) -> None:
+        """Record a terminal state and let Redis expire the job after the TTL."""
+        await self._write(job_id, fields, self._ttl_seconds)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self._redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {name: json.loads(value) for name, value in raw.items()}
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_job_store(redis_url: Optional[str], ttl_seconds: int):
+    """Return a RedisJobStore when ``redis_url`` is given, else an InMemoryJobStore."""
+    if redis_url:
+        return RedisJobStore(redis_url, ttl_seconds=ttl_seconds)
+    return InMemoryJobStore(ttl_seconds=ttl_seconds)
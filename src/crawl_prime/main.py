@@ -6,31 +6,53 @@ Delegates to the shared web modules in doctags_rag to avoid code duplication.
 
 import asyncio
 import argparse
-import json
-import sys
 from pathlib import Path
 
-# Dev-mode fallback: if contextprime is not installed as a package,
-# add the sibling doctags_rag directory to sys.path.
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
+import orjson
 
 from contextprime.processing.web.crawler import WebCrawler
 from contextprime.processing.web.mapper import WebDocTagsMapper
 
 
+class _FilenameTable(dict):
+    """
+    ``str.translate`` table keeping alphanumerics and ``._- ``.
+
+    Each codepoint is classified on first sight and memoised, so titles are
+    sanitised in a single C-level pass without a 1.1M-entry table up front.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = char.isalnum() or char in "._- "
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+_FILENAME_TABLE = _FilenameTable()
+
+
+def _write_json(path: Path, payload) -> None:
+    """Write ``payload`` to ``path`` as indented JSON."""
+    path.write_bytes(
+        orjson.dumps(
+            payload,
+            option=(
+                orjson.OPT_INDENT_2
+                | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS
+            ),
+            default=str,
+        )
+    )
+
+
 async def main():
     parser = argparse.ArgumentParser(description="CrawlPrime: Web to DocTags Crawler")
     parser.add_argument("--url", required=True, help="URL to crawl")
     parser.add_argument("--output", default="data/output", help="Output directory")
     args = parser.parse_args()
 
-    Path(args.output).mkdir(parents=True, exist_ok=True)
-
     crawler = WebCrawler()
     result = await crawler.crawl_url(args.url)
     if not result.success:
@@ -40,16 +62,18 @@ async def main():
     mapper = WebDocTagsMapper()
     doctags = mapper.map_to_doctags(result)
 
-    safe = "".join(x for x in result.title if x.isalnum() or x in "._- ") or "doc"
-    out = Path(args.output) / f"{safe[:50]}.json"
-    out.write_text(
-        json.dumps(
-            doctags.model_dump() if hasattr(doctags, "model_dump") else
-            doctags.__dict__ if hasattr(doctags, "__dict__") else str(doctags),
-            indent=2,
-            default=str,
-        )
+    safe = result.title.translate(_FILENAME_TABLE) or "doc"
+    output_dir = Path(args.output)
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
+    out = output_dir / f"{safe[:50]}.json"
+    payload = (
+        doctags.model_dump() if hasattr(doctags, "model_dump") else
+        doctags.__dict__ if hasattr(doctags, "__dict__") else str(doctags)
     )
+    # Serializing and writing a multi-MB document is blocking work; keep it
+    # off the event loop.
+    await asyncio.to_thread(_write_json, out, payload)
     print(f"Saved to {out}")
 
 
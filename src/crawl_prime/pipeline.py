@@ -21,20 +21,15 @@ Usage::
     asyncio.run(main())
 """
 
-import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-
-# Dev-mode fallback: if contextprime is not installed as a package,
-# add the sibling doctags_rag directory to sys.path.
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
-
-from typing import Optional, Any
+from typing import List, Optional, Any, Union
+from cachetools import TTLCache
 from loguru import logger
+from prometheus_client import Histogram
+from qdrant_client import QdrantClient, models
 
 from contextprime.pipelines.web_ingestion import WebIngestionPipeline
 from contextprime.pipelines.document_ingestion import IngestionReport as WebIngestionReport
@@ -47,6 +42,59 @@ from contextprime.knowledge_graph.neo4j_manager import Neo4jManager
 from contextprime.knowledge_graph.graph_queries import GraphQueryInterface
 from contextprime.knowledge_graph.graph_ingestor import GraphIngestionManager
 
+# Wall time of the pipeline's top-level stages.  Retrieval and synthesis both
+# run inside AgenticPipeline.process_query(), so they are timed together as
+# "query"; answers served from the query cache are not observed.
+_STAGE_SECONDS = Histogram(
+    "crawlprime_pipeline_stage_seconds",
+    "Wall time of CrawlPrimePipeline stages",
+    ["stage"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+@dataclass
+class EmptyQueryResult:
+    """Returned by ``query()`` when the collection holds no content yet."""
+    query: str
+    answer: str = ""
+    results: list = field(default_factory=list)
+
+
+def _quantization_config(name: str) -> tuple:
+    """
+    Map a ``quantization`` name to Qdrant collection settings.
+
+    Returns:
+        (quantization_config, hnsw_config_diff); the HNSW diff is None when
+        the mode keeps the collection's existing graph settings.
+    """
+    if name == "binary":
+        # 1-bit vectors kept in RAM; Qdrant rescoring against the original
+        # vectors (on by default) recovers most of the recall.  The denser
+        # HNSW graph (m=32) offsets the coarser distances of 1-bit codes.
+        return (
+            models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            ),
+            models.HnswConfigDiff(m=32),
+        )
+    if name == "int8":
+        # Per-dimension scalar quantization to int8 (4x smaller than FP32);
+        # the 0.99 quantile clips outliers before computing the value range.
+        # Near-lossless, so the HNSW graph is left as it is.
+        return (
+            models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            ),
+            None,
+        )
+    raise ValueError(
+        f"Unknown quantization {name!r}; expected 'binary' or 'int8'"
+    )
+
 
 class CrawlPrimePipeline:
     """
@@ -72,6 +120,10 @@ class CrawlPrimePipeline:
         storage_path: Optional[Path] = None,
         raptor_pipeline: Optional[Any] = None,
         community_pipeline: Optional[Any] = None,
+        query_cache_size: int = 256,
+        query_cache_ttl: float = 300.0,
+        quantization: Optional[str] = None,
+        ingest_concurrency: int = 8,
     ):
         """
         Args:
@@ -89,12 +141,42 @@ class CrawlPrimePipeline:
             storage_path:       Directory for RL Q-table and memory storage.
             raptor_pipeline:    Optional RAPTOR pipeline forwarded to AgenticPipeline.
             community_pipeline: Optional community detection pipeline forwarded to AgenticPipeline.
+            query_cache_size:   Max cached query answers (0 disables the cache).
+            query_cache_ttl:    Seconds a cached answer stays valid.
+            quantization:       Qdrant vector quantization for the collection
+                                ("binary" or "int8"), applied once the
+                                collection exists.
+            ingest_concurrency: Max URLs crawled and indexed at the same time.
         """
         self.collection = collection
 
+        # Answer cache for repeated queries.  Keyed on whitespace/case-
+        # normalised text plus the query knobs; cleared on every ingest so
+        # answers never outlive the content they were built from in this
+        # process (the TTL bounds staleness across workers).
+        self._query_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=query_cache_size, ttl=query_cache_ttl)
+            if query_cache_size > 0 else None
+        )
+        # Bumped by every completed ingest.  query() and _point_count() only
+        # cache a value if no ingest finished while it was being computed, so
+        # a pre-ingest answer or count cannot be stored after the clear.
+        self._ingest_generation = 0
+
+        # Bounds concurrent ingest() calls (ingest_many() fan-out and parallel
+        # API jobs alike) so a burst cannot open unbounded crawler sessions
+        # and embedding requests at once.
+        self._ingest_semaphore = asyncio.Semaphore(ingest_concurrency)
+
+        # Short-lived cache of the collection's point count so query() can
+        # skip the agentic loop on an empty collection without a Qdrant
+        # round trip per request.
+        self._count_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+
         # Persistent storage path for RL and memory
         self._storage_path = storage_path or Path("data/crawlprime")
-        self._storage_path.mkdir(parents=True, exist_ok=True)
+        if not self._storage_path.is_dir():
+            self._storage_path.mkdir(parents=True, exist_ok=True)
 
         # Shared Qdrant config — used for both ingestion and retrieval so that
         # the explicit qdrant_host/qdrant_port params are always honoured
@@ -106,30 +188,36 @@ class CrawlPrimePipeline:
             collection_name=collection,
         )
 
-        # Neo4j (graceful fallback if unreachable).
-        # A single Neo4jManager is shared by retrieval and ingestion — the driver
-        # maintains an internal connection pool that handles both concurrently.
-        self._neo4j = None
-        self._graph_queries = None
-        self._graph_ingestor = None
-        _graph_weight = 0.0
-        try:
-            neo4j_cfg = Neo4jConfig(
-                uri=f"bolt://{neo4j_host}:{neo4j_port}",
-                username=neo4j_user,
-                password=neo4j_password,
-            )
-            self._neo4j = Neo4jManager(config=neo4j_cfg)
-            self._graph_queries = GraphQueryInterface(neo4j_manager=self._neo4j)
-            # Share the same Neo4jManager for ingestion — the driver uses an
-            # internal connection pool, so a single driver handles concurrent
-            # ingestion and retrieval sessions without redundant pool overhead.
-            self._graph_ingestor = GraphIngestionManager(
-                neo4j_manager=self._neo4j
+        # Admin client for collection-level settings that ContextPrime's
+        # QdrantManager does not expose (quantization, HNSW parameters).
+        self._qdrant_admin = QdrantClient(
+            host=qdrant_host, port=qdrant_port, check_compatibility=False
+        )
+        self._quantization, self._hnsw_config = (
+            _quantization_config(quantization) if quantization else (None, None)
+        )
+        self._quantization_applied = False
+
+        # Connection setup is I/O-bound and independent: Neo4j connects while
+        # both QdrantManagers are built, so construction takes as long as the
+        # slowest of the three rather than their sum.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            neo4j_future = pool.submit(
+                self._connect_neo4j,
+                neo4j_host, neo4j_port, neo4j_user, neo4j_password,
             )
-            _graph_weight = graph_weight
-        except Exception as err:
-            logger.warning("Neo4j unavailable, graph retrieval disabled: %s", err)
+            ingestion_qdrant_future = pool.submit(QdrantManager, config=qdrant_cfg)
+            retrieval_qdrant_future = pool.submit(QdrantManager, config=qdrant_cfg)
+            (
+                self._neo4j,
+                self._graph_queries,
+                self._graph_ingestor,
+            ) = neo4j_future.result()
+            ingestion_qdrant = ingestion_qdrant_future.result()
+            # Retrieval Qdrant is stored so close() can release it
+            # (HybridRetriever.close() skips Qdrant when _owns_qdrant=False).
+            self._retrieval_qdrant = retrieval_qdrant_future.result()
+        _graph_weight = graph_weight if self._neo4j is not None else 0.0
 
         # Ingestion pipeline — pass explicit managers so ingestion uses the
         # same Qdrant host and Neo4j credentials as the caller specified.
@@ -139,16 +227,14 @@ class CrawlPrimePipeline:
         )
         self._storage = DocumentIngestionPipeline(
             config=ingestion_cfg,
-            qdrant_manager=QdrantManager(config=qdrant_cfg),
+            qdrant_manager=ingestion_qdrant,
             graph_ingestor=self._graph_ingestor,
         )
         self._web_ingestion = WebIngestionPipeline(
             document_ingestion_pipeline=self._storage,
         )
 
-        # Retrieval pipeline — store the Qdrant manager so close() can release it
-        # (HybridRetriever.close() skips Qdrant when _owns_qdrant=False).
-        self._retrieval_qdrant = QdrantManager(config=qdrant_cfg)
+        # Retrieval pipeline
         self._retriever = HybridRetriever(
             qdrant_manager=self._retrieval_qdrant,
             neo4j_manager=self._neo4j,
@@ -171,9 +257,16 @@ class CrawlPrimePipeline:
             storage_path=self._storage_path,
         )
 
+        # The collection may already exist from an earlier run; otherwise
+        # quantization is applied after the first ingest creates it.
+        try:
+            self._ensure_quantization()
+        except Exception as err:
+            logger.warning("Could not apply Qdrant quantization yet: {}", err)
+
         logger.info(
-            "CrawlPrimePipeline initialised (collection=%s, synthesis=%s, "
-            "graph=%s, lexical=%s)",
+            "CrawlPrimePipeline initialised (collection={}, synthesis={}, "
+            "graph={}, lexical={})",
             collection,
             enable_synthesis,
             self._neo4j is not None,
@@ -190,21 +283,133 @@ class CrawlPrimePipeline:
         Returns:
             WebIngestionReport with chunks_ingested count and any failures.
         """
-        logger.info("CrawlPrime ingesting: %s", url)
-        report = await self._web_ingestion.ingest_url(url)
+        async with self._ingest_semaphore:
+            logger.info("CrawlPrime ingesting: {}", url)
+            try:
+                with _STAGE_SECONDS.labels(stage="ingest").time():
+                    report = await self._web_ingestion.ingest_url(url)
+            finally:
+                # Invalidate even if ingestion failed or was cancelled: some
+                # chunks may already have been stored.
+                self._ingest_generation += 1
+                if self._query_cache is not None:
+                    self._query_cache.clear()
+                self._count_cache.clear()
+        if self._quantization is not None and not self._quantization_applied:
+            # The content is already stored; a failed settings update must
+            # not turn a successful ingest into an error.  It is retried
+            # after the next ingest.
+            try:
+                await asyncio.to_thread(self._ensure_quantization)
+            except Exception as err:
+                logger.warning("Could not apply Qdrant quantization: {}", err)
         logger.info(
-            "Ingestion complete — %d chunks stored, %d failures",
+            "Ingestion complete — {} chunks stored, {} failures",
             report.chunks_ingested,
             len(report.failed_documents),
         )
         return report
 
+    @staticmethod
+    def _connect_neo4j(host: str, port: int, user: str, password: str) -> tuple:
+        """
+        Connect to Neo4j (graceful fallback if unreachable).
+
+        A single Neo4jManager is shared by retrieval and ingestion — the driver
+        maintains an internal connection pool that handles both concurrently.
+
+        Returns:
+            (neo4j_manager, graph_queries, graph_ingestor), all None on failure.
+        """
+        try:
+            neo4j_cfg = Neo4jConfig(
+                uri=f"bolt://{host}:{port}",
+                username=user,
+                password=password,
+            )
+            neo4j = Neo4jManager(config=neo4j_cfg)
+            graph_queries = GraphQueryInterface(neo4j_manager=neo4j)
+            # Share the same Neo4jManager for ingestion — the driver uses an
+            # internal connection pool, so a single driver handles concurrent
+            # ingestion and retrieval sessions without redundant pool overhead.
+            graph_ingestor = GraphIngestionManager(neo4j_manager=neo4j)
+            return neo4j, graph_queries, graph_ingestor
+        except Exception as err:
+            logger.warning("Neo4j unavailable, graph retrieval disabled: {}", err)
+            return None, None, None
+
+    def _ensure_quantization(self) -> None:
+        """Apply the configured quantization once the collection exists."""
+        if self._quantization is None or self._quantization_applied:
+            return
+        if not self._qdrant_admin.collection_exists(self.collection):
+            return
+        self._qdrant_admin.update_collection(
+            collection_name=self.collection,
+            quantization_config=self._quantization,
+            hnsw_config=self._hnsw_config,
+        )
+        self._quantization_applied = True
+        logger.info("Qdrant quantization enabled for {}", self.collection)
+
+    async def _point_count(self) -> Optional[int]:
+        """
+        Approximate number of points in the collection, cached for 10 s.
+
+        Returns 0 if the collection does not exist yet and None if Qdrant
+        could not be asked, in which case query() takes the normal path.
+        """
+        count = self._count_cache.get("points")
+        if count is not None:
+            return count
+
+        def _fetch() -> int:
+            if not self._qdrant_admin.collection_exists(self.collection):
+                return 0
+            return self._qdrant_admin.count(
+                collection_name=self.collection, exact=False
+            ).count
+
+        generation = self._ingest_generation
+        try:
+            count = await asyncio.to_thread(_fetch)
+        except Exception as err:
+            logger.debug("Qdrant point count unavailable: {}", err)
+            return None
+        # A count read before an ingest finished must not outlive it.
+        if generation == self._ingest_generation:
+            self._count_cache["points"] = count
+        return count
+
+    async def ingest_many(
+        self, urls: List[str]
+    ) -> List[Union[WebIngestionReport, BaseException]]:
+        """
+        Crawl and index several URLs concurrently (at most
+        ``ingest_concurrency`` at a time).
+
+        Duplicate URLs are crawled once and share a report.
+
+        Args:
+            urls: The URLs to crawl and ingest.
+
+        Returns:
+            One entry per input URL, in order: its WebIngestionReport, or the
+            exception raised while ingesting it.
+        """
+        unique = list(dict.fromkeys(urls))
+        outcomes = await asyncio.gather(
+            *(self.ingest(url) for url in unique), return_exceptions=True
+        )
+        by_url = dict(zip(unique, outcomes))
+        return [by_url[url] for url in urls]
+
     async def query(
         self,
         text: str,
         max_iterations: int = 2,
         min_quality_threshold: float = 0.5,
-    ) -> AgenticResult:
+    ) -> Union[AgenticResult, EmptyQueryResult]:
         """
         Query the indexed web content.
 
@@ -214,13 +419,32 @@ class CrawlPrimePipeline:
             min_quality_threshold: Minimum quality score to accept answer.
 
         Returns:
-            AgenticResult with .answer and .results.
+            AgenticResult with .answer and .results, or an EmptyQueryResult
+            (empty answer, no results) when nothing has been ingested yet.
         """
-        return await self._agentic.process_query(
-            text,
-            max_iterations=max_iterations,
-            min_quality_threshold=min_quality_threshold,
+        if await self._point_count() == 0:
+            return EmptyQueryResult(query=text)
+
+        cache_key = (
+            " ".join(text.lower().split()),
+            max_iterations,
+            min_quality_threshold,
         )
+        if self._query_cache is not None:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        generation = self._ingest_generation
+        with _STAGE_SECONDS.labels(stage="query").time():
+            result = await self._agentic.process_query(
+                text,
+                max_iterations=max_iterations,
+                min_quality_threshold=min_quality_threshold,
+            )
+        if self._query_cache is not None and generation == self._ingest_generation:
+            self._query_cache[cache_key] = result
+        return result
 
     def __enter__(self) -> "CrawlPrimePipeline":
         return self
@@ -228,25 +452,46 @@ class CrawlPrimePipeline:
     def __exit__(self, *_) -> None:
         self.close()
 
+    async def __aenter__(self) -> "CrawlPrimePipeline":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+    def _closeables(self) -> list:
+        """Resources owned by this pipeline, each with a blocking close()."""
+        return [
+            resource
+            for resource in (
+                # Ingestion pipeline — closes its own QdrantManager; leaves
+                # graph_ingestor open because _owns_graph_ingestor=False.
+                self._storage,
+                # Retrieval Qdrant — not closed by HybridRetriever because
+                # _owns_qdrant=False when an explicit manager is passed.
+                self._retrieval_qdrant,
+                self._qdrant_admin,
+                # Neo4j manager — shared by retrieval and ingestion.
+                self._neo4j,
+            )
+            if resource is not None
+        ]
+
     def close(self) -> None:
         """Release resources."""
-        # Close ingestion pipeline (closes its own QdrantManager; leaves
-        # graph_ingestor open because _owns_graph_ingestor=False).
-        try:
-            self._storage.close()
-        except Exception:
-            pass
-        # Close retrieval Qdrant (not closed by HybridRetriever because
-        # _owns_qdrant=False when an explicit manager is passed).
-        for qdrant in (self._retrieval_qdrant,):
+        for resource in self._closeables():
             try:
-                if qdrant is not None:
-                    qdrant.close()
+                resource.close()
             except Exception:
                 pass
-        # Close the Neo4j manager (shared by retrieval and ingestion).
-        try:
-            if self._neo4j is not None:
-                self._neo4j.close()
-        except Exception:
-            pass
+
+    async def aclose(self) -> None:
+        """
+        Release resources without blocking the event loop.
+
+        The close() calls are independent, so they run concurrently in worker
+        threads and shutdown takes as long as the slowest one.
+        """
+        await asyncio.gather(
+            *(asyncio.to_thread(r.close) for r in self._closeables()),
+            return_exceptions=True,
+        )
@@ -7,34 +7,53 @@ steps are made to depend on it.
 
 This module owns:
   - WEB_INGESTION step type (a CrawlPrime concept)
-  - URL detection regex
+  - URL detection regex, single-query and batched
   - Dependency ordering: WEB_INGESTION → RETRIEVAL → downstream steps
 """
 
-import sys
+import bisect
+import functools
+import heapq
 import re
-from pathlib import Path
+from dataclasses import replace
 from enum import Enum
-from typing import Optional
-
-# Dev-mode fallback: if contextprime is not installed as a package,
-# add the sibling doctags_rag directory to sys.path.
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
+from typing import List, Optional, Sequence
 
 from contextprime.agents.planning_agent import PlanStep, StepType, ExecutionMode
 
-# First pass: capture everything that looks like a URL (any non-whitespace).
-_URL_RE = re.compile(r'https?://\S+')
-# Second pass: strip trailing punctuation that is almost never part of a URL
-# but frequently terminates one in prose ("see https://example.com.").
-# Periods, commas and closing brackets are stripped from the right only,
-# so mid-URL punctuation (domain dots, path slashes) is preserved.
-_TRAILING_PUNCT_RE = re.compile(r'[.,;:!?)\]\'"<>]+$')
+# A URL runs until whitespace, a quote, an angle bracket or any bracket, so
+# wrappers such as "(https://a.b)" or "<https://a.b>" never enter the match.
+_URL_RE = re.compile(r'https?://[^\s<>()\[\]\'"]+')
+# Sentence punctuation can still end a match ("see https://example.com.");
+# it is stripped from the right only, so mid-URL dots and query strings
+# are preserved.
+_TRAILING_PUNCT = ".,;:!?"
+# Joins queries for batch scanning.  \s matches it, so no URL match can run
+# from one query into the next.
+_QUERY_SEP = "\x1e"
+
+
+@functools.lru_cache(maxsize=1024)
+def _step_id(n: int) -> str:
+    """Return ``"step_{n}"``, reusing one string object per step number."""
+    return f"step_{n}"
+
+
+def _bump(step_id: str) -> str:
+    """
+    Renumber a step id by +1: ``step_3`` → ``step_4``.
+
+    Only the number after the last underscore is used, so ids from other
+    planners (``retrieve_1``) are renumbered into the ``step_{n}`` scheme.
+    """
+    try:
+        n = int(step_id.rpartition("_")[2])
+    except ValueError:
+        raise ValueError(
+            f"Cannot renumber plan step {step_id!r}: expected an id ending "
+            f"in _<number>, such as 'step_3'"
+        ) from None
+    return _step_id(n + 1)
 
 
 class WebStepType(Enum):
@@ -42,6 +61,90 @@ class WebStepType(Enum):
     WEB_INGESTION = "web_ingestion"
 
 
+@functools.lru_cache(maxsize=256)
+def _plan_layout(
+    query: str,
+    step_sig: tuple,
+    step_counter_start: int,
+) -> Optional[tuple]:
+    """
+    Compute the URL and renumbered DAG shape for a query and step signature.
+
+    Retries and self-reflection loops re-plan the same query repeatedly, so
+    the result is memoised.  Only hashable ids and dependencies are cached;
+    PlanStep objects are always rebuilt from the caller's steps.
+
+    Args:
+        query:               The user query.
+        step_sig:            ((step_id, step_type, dependencies), ...) per step.
+        step_counter_start:  The step counter value before any steps were added.
+
+    Returns:
+        (url, web_step_id, ((index, new_id, new_deps), ...)) in dependency
+        order, where ``index`` is the step's position in ``step_sig``; or
+        None if no URL.
+    """
+    url_match = _URL_RE.search(query)
+    if not url_match:
+        return None
+
+    # Strip trailing punctuation that commonly follows URLs in prose.
+    url = url_match.group().rstrip(_TRAILING_PUNCT)
+
+    web_step_id = _step_id(step_counter_start)
+
+    # Old id → new id, with the numeric suffix bumped by 1.  Built once;
+    # every step and dependency reference is then a single dict lookup.
+    remap = {step_id: _bump(step_id) for step_id, _, _ in step_sig}
+
+    # Renumber existing steps by +1 and remap ALL dependency references so
+    # the DAG remains consistent.  RETRIEVAL steps that had no dependencies
+    # gain a new dependency on the web-ingestion step.
+    layout = []
+    for step_id, step_type, dependencies in step_sig:
+        if step_type is StepType.RETRIEVAL and not dependencies:
+            deps = (web_step_id,)
+        else:
+            # Remap every dependency to its new (bumped) ID, including ids
+            # that are not steps of this plan.
+            deps = tuple(
+                remap[d] if d in remap else _bump(d) for d in dependencies
+            )
+        layout.append((remap[step_id], deps))
+
+    # Emit the steps in dependency order (Kahn's algorithm) so an executor
+    # can schedule them in one forward scan.  Ready steps are taken in their
+    # original position order, so a plan that is already topologically
+    # ordered comes back unchanged.  Dependencies on the web step need no
+    # edge: it is always emitted first.
+    position = {new_id: i for i, (new_id, _) in enumerate(layout)}
+    dependents = [[] for _ in layout]
+    indegree = [0] * len(layout)
+    for i, (_, deps) in enumerate(layout):
+        for dep in deps:
+            j = position.get(dep)
+            if j is not None:
+                dependents[j].append(i)
+                indegree[i] += 1
+
+    ready = [i for i, n in enumerate(indegree) if n == 0]
+    order = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for k in dependents[i]:
+            indegree[k] -= 1
+            if indegree[k] == 0:
+                heapq.heappush(ready, k)
+
+    # A cycle cannot be ordered; leave its steps in the caller's order.
+    if len(order) < len(layout):
+        emitted = set(order)
+        order.extend(i for i in range(len(layout)) if i not in emitted)
+
+    return url, web_step_id, tuple((i, *layout[i]) for i in order)
+
+
 def prepend_web_ingestion_step(
     query: str,
     steps: list,
@@ -59,14 +162,20 @@ def prepend_web_ingestion_step(
     Returns:
         (steps, web_step_id) where web_step_id is None if no URL was detected.
     """
-    url_match = _URL_RE.search(query)
-    if not url_match:
+    # Most queries carry no URL; a substring test rejects them without
+    # entering the regex engine.
+    if "http" not in query:
         return steps, None
 
-    # Strip trailing punctuation that commonly follows URLs in prose.
-    url = _TRAILING_PUNCT_RE.sub("", url_match.group())
-
-    web_step_id = f"step_{step_counter_start}"
+    step_sig = tuple(
+        (s.step_id, s.step_type, tuple(s.dependencies)) for s in steps
+    )
+    # An empty plan has nothing to renumber; keep it out of the cache.
+    plan_layout = _plan_layout if steps else _plan_layout.__wrapped__
+    layout = plan_layout(query, step_sig, step_counter_start)
+    if layout is None:
+        return steps, None
+    url, web_step_id, renumbering = layout
 
     web_step = PlanStep(
         step_id=web_step_id,
@@ -77,33 +186,39 @@ def prepend_web_ingestion_step(
         execution_mode=ExecutionMode.SEQUENTIAL,
     )
 
-    def _bump(step_id: str) -> str:
-        """Increment the numeric suffix of a step_id by 1."""
-        return f"step_{int(step_id.split('_')[-1]) + 1}"
-
-    # Renumber existing steps by +1 and remap ALL dependency references so
-    # the DAG remains consistent.  RETRIEVAL steps that had no dependencies
-    # gain a new dependency on the web-ingestion step.
-    renumbered = []
-    for step in steps:
-        new_id = _bump(step.step_id)
-        if step.step_type == StepType.RETRIEVAL and not step.dependencies:
-            deps = [web_step_id]
-        else:
-            # Remap every dependency to its new (bumped) ID.
-            deps = [_bump(d) for d in step.dependencies]
-        renumbered.append(PlanStep(
-            step_id=new_id,
-            step_type=step.step_type,
-            description=step.description,
-            parameters=step.parameters,
-            dependencies=deps,
-            execution_mode=step.execution_mode,
-            estimated_time_ms=step.estimated_time_ms,
-            estimated_cost=step.estimated_cost,
-            priority=step.priority,
-            required=step.required,
-            metadata=step.metadata,
-        ))
+    # Copy each step with only its id and dependencies changed; every other
+    # PlanStep field carries over, whatever fields ContextPrime adds.
+    renumbered = [
+        replace(steps[index], step_id=new_id, dependencies=list(deps))
+        for index, new_id, deps in renumbering
+    ]
 
     return [web_step] + renumbered, web_step_id
+
+
+def extract_urls(queries: Sequence[str]) -> List[List[str]]:
+    """
+    Find every URL in each of a batch of queries.
+
+    The queries are joined with a separator and scanned with a single
+    ``finditer`` pass; each match is mapped back to its query through the
+    queries' start offsets.  URLs are cleaned the same way as in
+    prepend_web_ingestion_step().
+
+    Args:
+        queries: The user queries to scan.
+
+    Returns:
+        One list of URLs per query, in order of appearance (empty if none).
+    """
+    starts = []
+    offset = 0
+    for query in queries:
+        starts.append(offset)
+        offset += len(query) + len(_QUERY_SEP)
+
+    urls: List[List[str]] = [[] for _ in queries]
+    for match in _URL_RE.finditer(_QUERY_SEP.join(queries)):
+        index = bisect.bisect_right(starts, match.start()) - 1
+        urls[index].append(match.group().rstrip(_TRAILING_PUNCT))
+    return urls
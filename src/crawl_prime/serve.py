@@ -0,0 +1,67 @@
+"""
+Production entry point for the CrawlPrime API.
+
+Runs uvicorn with the uvloop event loop and the httptools HTTP parser:
+
+  python -m crawl_prime.serve --port 8001
+  REDIS_URL=redis://localhost:6379/0 python -m crawl_prime.serve --workers 4
+
+Ingest jobs and their SSE notifications live in the worker that accepted
+them unless REDIS_URL is set, so more than one worker requires Redis.  The
+default is one worker, or one per CPU when REDIS_URL is set.  Each worker
+builds its own CrawlPrimePipeline and database connections.
+
+Gunicorn alternative (preloads the app once before forking workers; as
+above, more than one worker requires REDIS_URL):
+
+  REDIS_URL=redis://localhost:6379/0 gunicorn crawl_prime.api:app \\
+    -k uvicorn.workers.UvicornWorker --preload -w 4
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+
+def _default_workers() -> int:
+    """$WEB_CONCURRENCY if set; else one per CPU with Redis, one without."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    if os.getenv("REDIS_URL"):
+        return os.cpu_count() or 1
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CrawlPrime: serve the REST API")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8001, help="Bind port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_default_workers(),
+        help="Worker processes (default: $WEB_CONCURRENCY, else one per CPU "
+             "when REDIS_URL is set, else 1)",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1 and not os.getenv("REDIS_URL"):
+        parser.error(
+            f"{args.workers} workers need REDIS_URL: without it ingest jobs "
+            "are per-worker and GET /ingest/<job_id> returns 404 from the "
+            "other workers"
+        )
+
+    uvicorn.run(
+        "crawl_prime.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+    )
+
+
+if __name__ == "__main__":
+    main()
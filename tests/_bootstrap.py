@@ -0,0 +1,27 @@
+"""
+Dev-mode import path wiring for the test suite.
+
+When ContextPrime is not installed as a package, the sibling ``doctags_rag``
+checkout is put on ``sys.path`` once, from the root ``tests/conftest.py``
+(which pytest always loads before any test module or nested conftest).
+
+Lives under ``tests/`` rather than ``crawl_prime`` because importing the
+package itself already requires ``contextprime``.
+
+``DOCTAGS_ROOT`` is resolved once here; the integration conftest reuses it
+to locate the shared ``.env`` instead of resolving its own path.
+"""
+
+import sys
+from pathlib import Path
+
+DOCTAGS_ROOT = Path(__file__).resolve().parents[2] / "doctags_rag"
+
+
+def ensure_doctags_on_path() -> None:
+    """Add the sibling doctags_rag checkout to sys.path if contextprime is missing."""
+    try:
+        import contextprime  # noqa: F401 — check if installed
+    except ImportError:
+        if DOCTAGS_ROOT.exists() and str(DOCTAGS_ROOT) not in sys.path:
+            sys.path.insert(0, str(DOCTAGS_ROOT))
@@ -11,7 +11,8 @@ The document parsing dependencies are not required.
 
 import sys
 from types import ModuleType
-from pathlib import Path
+
+from ._bootstrap import ensure_doctags_on_path
 
 # ── Stub heavy ContextPrime-only dependencies ──────────────────────────────
 _STUBS = [
@@ -28,13 +29,10 @@ _STUBS = [
     # PIL/Pillow is NOT stubbed — crawl4ai depends on it and it is installed
 ]
 for _name in _STUBS:
-    if _name not in sys.modules:
-        sys.modules[_name] = ModuleType(_name)
+    # Real modules that are already imported win; setdefault is one lookup.
+    sys.modules.setdefault(_name, ModuleType(_name))
 
 # ── Add doctags_rag to sys.path (dev-mode fallback) ───────────────────────
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[2] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
+# Done once here for the whole suite; nested conftests and test modules
+# rely on this file being imported first.
+ensure_doctags_on_path()
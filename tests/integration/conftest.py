@@ -7,22 +7,16 @@ Requires:
   - playwright chromium installed
 """
 
+import functools
 import os
-import sys
 import uuid
-from pathlib import Path
 
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
+from .._bootstrap import DOCTAGS_ROOT
 
 # Load .env so NEO4J_PASSWORD, OPENAI_API_KEY etc. are available
 try:
     from dotenv import load_dotenv
-    _ENV = Path(__file__).resolve().parents[3] / "doctags_rag" / ".env"
+    _ENV = DOCTAGS_ROOT / ".env"
     if _ENV.exists():
         load_dotenv(_ENV, override=False)
 except ImportError:
@@ -45,9 +39,14 @@ import pytest
 
 _NEO4J_URI = "bolt://localhost:7687"
 _NEO4J_USER = os.getenv("NEO4J_USERNAME", "neo4j")
-_NEO4J_PASS = os.getenv("NEO4J_PASSWORD", "replace_with_strong_neo4j_password")
+# No default: without a password the bolt handshake can only fail, so
+# _neo4j_reachable() answers False without touching the network.
+_NEO4J_PASS = os.getenv("NEO4J_PASSWORD")
 
 
+# Reachability is probed once per test session; the requires_services marker
+# and every module's cleanup fixture share the cached answer.
+@functools.lru_cache(maxsize=1)
 def _qdrant_reachable() -> bool:
     try:
         from qdrant_client import QdrantClient
@@ -58,7 +57,10 @@ def _qdrant_reachable() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def _neo4j_reachable() -> bool:
+    if _NEO4J_PASS is None:
+        return False
     try:
         from neo4j import GraphDatabase
         driver = GraphDatabase.driver(_NEO4J_URI, auth=(_NEO4J_USER, _NEO4J_PASS))
@@ -69,10 +71,17 @@ def _neo4j_reachable() -> bool:
         return False
 
 
-requires_services = pytest.mark.skipif(
-    not (_qdrant_reachable() and _neo4j_reachable()),
-    reason="Qdrant or Neo4j not reachable — skipping integration test",
-)
+# Marker only — the network probes run in pytest_runtest_setup for tests that
+# are actually about to execute, not at import/collection time, so
+# deselected or --collect-only runs never touch the network.
+requires_services = pytest.mark.requires_services
+
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker("requires_services") is None:
+        return
+    if not (_qdrant_reachable() and _neo4j_reachable()):
+        pytest.skip("Qdrant or Neo4j not reachable — skipping integration test")
 
 
 @pytest.fixture(scope="module")
@@ -80,16 +89,25 @@ def test_collection_name():
     return f"crawlprime_test_{uuid.uuid4().hex[:8]}"
 
 
+@pytest.fixture(scope="session")
+def qdrant_client():
+    """One Qdrant client shared by every cleanup fixture; None if Qdrant is down."""
+    if not _qdrant_reachable():
+        yield None
+        return
+    from qdrant_client import QdrantClient
+    client = QdrantClient(host="localhost", port=6333, check_compatibility=False)
+    yield client
+    client.close()
+
+
 @pytest.fixture(scope="module")
-def cleanup_test_collection(test_collection_name):
+def cleanup_test_collection(test_collection_name, qdrant_client):
     yield
-    if not _qdrant_reachable():
+    if qdrant_client is None:
         return
     try:
-        from qdrant_client import QdrantClient
-        client = QdrantClient(host="localhost", port=6333, check_compatibility=False)
-        cols = [c.name for c in client.get_collections().collections]
-        if test_collection_name in cols:
-            client.delete_collection(test_collection_name)
+        # A missing collection is not an error; no need to list them first.
+        qdrant_client.delete_collection(test_collection_name)
     except Exception:
         pass
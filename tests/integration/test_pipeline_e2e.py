@@ -16,18 +16,9 @@ Run with:
 """
 
 import os
-import sys
-from pathlib import Path
-
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
 
 import pytest
-from .conftest import requires_services
+from .conftest import requires_services, _NEO4J_PASS
 from crawl_prime.pipeline import CrawlPrimePipeline
 
 pytestmark = pytest.mark.integration
@@ -37,6 +28,10 @@ _requires_openai = pytest.mark.skipif(
     reason="OPENAI_API_KEY not set — skipping synthesis test",
 )
 
+# Words from _TEST_PAGE_HTML; a grounded answer mentions at least one.
+_PAGE_KEYWORDS = frozenset({"acme", "safety", "protective", "glove", "stop",
+                            "blade", "water", "emergency", "widget"})
+
 _TEST_PAGE_HTML = """<!DOCTYPE html>
 <html>
 <head><title>Acme Widget Manual</title></head>
@@ -67,7 +62,7 @@ async def test_ingest_then_query_returns_grounded_answer(
     pipeline = CrawlPrimePipeline(
         collection=test_collection_name,
         enable_synthesis=True,
-        neo4j_password=os.getenv("NEO4J_PASSWORD", "replace_with_strong_neo4j_password"),
+        neo4j_password=_NEO4J_PASS,
     )
 
     # Ingest
@@ -84,12 +79,10 @@ async def test_ingest_then_query_returns_grounded_answer(
     assert result.answer and len(result.answer) > 30
     assert "Retrieved content" not in result.answer
 
-    page_keywords = {"acme", "safety", "protective", "glove", "stop",
-                     "blade", "water", "emergency", "widget"}
-    matched = page_keywords & set(result.answer.lower().split())
+    matched = _PAGE_KEYWORDS.intersection(result.answer.lower().split())
     assert matched, (
         f"Answer does not reference page content.\n"
-        f"Expected one of: {page_keywords}\nAnswer: {result.answer[:400]}"
+        f"Expected one of: {sorted(_PAGE_KEYWORDS)}\nAnswer: {result.answer[:400]}"
     )
 
     pipeline.close()
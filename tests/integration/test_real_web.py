@@ -14,25 +14,21 @@ Run with:
 """
 
 import os
-import sys
 import uuid
-from pathlib import Path
-
-try:
-    import contextprime  # noqa: F401 — check if installed
-except ImportError:
-    _DOCTAGS_ROOT = Path(__file__).resolve().parents[3] / "doctags_rag"
-    if _DOCTAGS_ROOT.exists() and str(_DOCTAGS_ROOT) not in sys.path:
-        sys.path.insert(0, str(_DOCTAGS_ROOT))
 
 import pytest
-from .conftest import requires_services, _qdrant_reachable
+from .conftest import requires_services, _NEO4J_PASS
 from crawl_prime.pipeline import CrawlPrimePipeline
 
 pytestmark = pytest.mark.real_web
 
 _SITE_URL = "https://worldwidecloud.io"
 
+_LONDON_BOROUGHS = frozenset({"westminster", "camden", "southwark", "lambeth",
+                              "wandsworth", "london", "islington"})
+_DIFFERENTIATORS = frozenset({"2008", "ibm", "quantum", "amazon", "apple",
+                              "automation", "small", "enterprise", "london"})
+
 _requires_openai = pytest.mark.skipif(
     not os.getenv("OPENAI_API_KEY"),
     reason="OPENAI_API_KEY not set — skipping real-web synthesis test",
@@ -45,16 +41,12 @@ def real_collection_name():
 
 
 @pytest.fixture(scope="module")
-def cleanup_real_collection(real_collection_name):
+def cleanup_real_collection(real_collection_name, qdrant_client):
     yield
-    if not _qdrant_reachable():
+    if qdrant_client is None:
         return
     try:
-        from qdrant_client import QdrantClient
-        client = QdrantClient(host="localhost", port=6333, check_compatibility=False)
-        cols = [c.name for c in client.get_collections().collections]
-        if real_collection_name in cols:
-            client.delete_collection(real_collection_name)
+        qdrant_client.delete_collection(real_collection_name)
     except Exception:
         pass
 
@@ -70,7 +62,7 @@ def ingested_pipeline(real_collection_name, cleanup_real_collection):
     pipeline = CrawlPrimePipeline(
         collection=real_collection_name,
         enable_synthesis=True,
-        neo4j_password=os.getenv("NEO4J_PASSWORD", "replace_with_strong_neo4j_password"),
+        neo4j_password=_NEO4J_PASS,
     )
     report = asyncio.run(pipeline.ingest(_SITE_URL))
     assert report.chunks_ingested > 0, (
@@ -92,13 +84,10 @@ async def test_service_area_query(ingested_pipeline):
     assert result.answer and len(result.answer) > 30
     assert "Retrieved content" not in result.answer
 
-    answer_lower = result.answer.lower()
-    london_boroughs = {"westminster", "camden", "southwark", "lambeth",
-                       "wandsworth", "london", "islington"}
-    matched = london_boroughs & set(answer_lower.split())
+    matched = _LONDON_BOROUGHS.intersection(result.answer.lower().split())
     assert matched, (
         f"Answer does not mention any London boroughs.\n"
-        f"Expected one of: {london_boroughs}\nAnswer: {result.answer[:400]}"
+        f"Expected one of: {sorted(_LONDON_BOROUGHS)}\nAnswer: {result.answer[:400]}"
     )
 
 
@@ -128,12 +117,9 @@ async def test_faq_differentiator_query(ingested_pipeline):
     assert result.answer and len(result.answer) > 30
     assert "Retrieved content" not in result.answer
 
-    answer_lower = result.answer.lower()
-    differentiators = {"2008", "ibm", "quantum", "amazon", "apple",
-                       "automation", "small", "enterprise", "london"}
-    matched = differentiators & set(answer_lower.split())
+    matched = _DIFFERENTIATORS.intersection(result.answer.lower().split())
     assert len(matched) >= 2, (
         f"Answer should reference at least 2 differentiating terms.\n"
-        f"Expected 2+ of: {differentiators}\nMatched: {matched}\n"
+        f"Expected 2+ of: {sorted(_DIFFERENTIATORS)}\nMatched: {matched}\n"
         f"Answer: {result.answer[:400]}"
     )
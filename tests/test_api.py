@@ -0,0 +1,169 @@
+"""
+Unit tests for the CrawlPrime API's ingest plumbing.
+
+Uses a fake pipeline, so no ContextPrime services are needed.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import crawl_prime.api as api
+from crawl_prime.api import IngestDeduplicator
+from crawl_prime.jobs import InMemoryJobStore
+
+
+class _GatedPipeline:
+    """Fake pipeline whose ingest() blocks until ``release`` is set."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = []
+        self.release = asyncio.Event()
+        self._error = error
+
+    async def ingest(self, url):
+        self.calls.append(url)
+        await self.release.wait()
+        if self._error is not None:
+            raise self._error
+        return SimpleNamespace(url=url, chunks_ingested=3, failed_documents=[])
+
+
+class _FakePipeline:
+    """Stands in for CrawlPrimePipeline in the app's lifespan."""
+
+    def __init__(self, **_):
+        pass
+
+    async def ingest(self, url):
+        return SimpleNamespace(chunks_ingested=3, failed_documents=[])
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.setattr(api, "CrawlPrimePipeline", _FakePipeline)
+    with TestClient(api.app) as client:
+        yield client
+
+
+def _sse_frames(client, job_id):
+    with client.stream("GET", f"/ingest/{job_id}/stream") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return [
+            json.loads(line[len("data: "):])
+            for line in response.iter_lines()
+            if line.startswith("data: ")
+        ]
+
+
+class TestIngestStream:
+    def test_unknown_job_is_404(self, client):
+        assert client.get("/ingest/missing/stream").status_code == 404
+
+    def test_stream_ends_with_the_terminal_state(self, client):
+        job_id = client.post("/ingest", json={"url": "https://a.example"}).json()["job_id"]
+
+        frames = _sse_frames(client, job_id)
+
+        assert frames[-1] == {
+            "job_id": job_id,
+            "status": "done",
+            "url": "https://a.example",
+            "chunks_ingested": 3,
+            "failed": [],
+            "error": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_change_while_suspended_at_yield_is_not_missed(self, monkeypatch):
+        jobs = InMemoryJobStore(ttl_seconds=60)
+        monkeypatch.setattr(api.app.state, "jobs", jobs, raising=False)
+        monkeypatch.setattr(api, "_job_events", {"j": asyncio.Event()})
+        await jobs.create("j", status="pending", url="https://a.example")
+
+        stream = api._job_event_stream("j")
+        try:
+            assert '"status":"pending"' in await stream.__anext__()
+            # The job moves on before the stream resumes and starts waiting;
+            # the stream must wake now, not at the next heartbeat.
+            await jobs.update("j", status="running")
+            api._notify_job("j")
+            frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            assert '"status":"running"' in frame
+        finally:
+            await stream.aclose()
+
+
+class TestIngestDeduplicator:
+    @pytest.mark.asyncio
+    async def test_concurrent_jobs_for_one_url_share_an_ingest(self):
+        pipeline = _GatedPipeline()
+        ingests = IngestDeduplicator(pipeline)
+
+        waiters = [
+            asyncio.create_task(ingests.submit(url))
+            for url in ("https://a.example", "https://a.example", "https://b.example")
+        ]
+        await asyncio.sleep(0)
+        pipeline.release.set()
+        reports = await asyncio.gather(*waiters)
+
+        assert pipeline.calls == ["https://a.example", "https://b.example"]
+        assert reports[0] is reports[1]
+        assert reports[2].url == "https://b.example"
+
+    @pytest.mark.asyncio
+    async def test_url_is_ingested_again_once_the_first_ingest_ends(self):
+        pipeline = _GatedPipeline()
+        pipeline.release.set()
+        ingests = IngestDeduplicator(pipeline)
+
+        await ingests.submit("https://a.example")
+        await ingests.submit("https://a.example")
+
+        assert pipeline.calls == ["https://a.example", "https://a.example"]
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self):
+        pipeline = _GatedPipeline(error=RuntimeError("crawl failed"))
+        ingests = IngestDeduplicator(pipeline)
+
+        waiters = [
+            asyncio.create_task(ingests.submit("https://a.example")) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        pipeline.release.set()
+        outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert [str(o) for o in outcomes] == ["crawl failed", "crawl failed"]
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_waiters(self):
+        ingests = IngestDeduplicator(_GatedPipeline())
+        waiter = asyncio.create_task(ingests.submit("https://a.example"))
+        await asyncio.sleep(0)
+
+        await ingests.stop()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_the_shared_ingest(self):
+        pipeline = _GatedPipeline()
+        ingests = IngestDeduplicator(pipeline)
+        first = asyncio.create_task(ingests.submit("https://a.example"))
+        second = asyncio.create_task(ingests.submit("https://a.example"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        pipeline.release.set()
+
+        assert (await second).chunks_ingested == 3
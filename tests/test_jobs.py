@@ -0,0 +1,153 @@
+"""
+Unit tests for the ingest job stores.
+
+RedisJobStore runs against fakeredis, so no Redis server is needed.
+"""
+
+import functools
+
+import fakeredis
+import pytest
+import redis.asyncio
+from cachetools import TTLCache
+
+import crawl_prime.jobs as jobs_module
+from crawl_prime.jobs import InMemoryJobStore, RedisJobStore, create_job_store
+
+_TTL = 3600
+_INFLIGHT_TTL = 86_400
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis.asyncio, "from_url", lambda *_, **__: client)
+    return client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive InMemoryJobStore's TTL caches from a settable clock."""
+    now = [0.0]
+    monkeypatch.setattr(
+        jobs_module, "TTLCache", functools.partial(TTLCache, timer=lambda: now[0])
+    )
+    return now
+
+
+@pytest.fixture
+def redis_store(fake_redis):
+    return RedisJobStore(
+        "redis://fake", ttl_seconds=_TTL, inflight_ttl_seconds=_INFLIGHT_TTL
+    )
+
+
+class TestInMemoryJobStore:
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        store = InMemoryJobStore(ttl_seconds=_TTL)
+        await store.create("a", status="pending", url="https://example.com")
+        await store.update("a", status="running")
+        await store.finish("a", status="done", chunks_ingested=3, failed=[])
+
+        assert await store.get("a") == {
+            "status": "done",
+            "url": "https://example.com",
+            "chunks_ingested": 3,
+            "failed": [],
+        }
+        assert await store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_returns_a_copy(self):
+        store = InMemoryJobStore(ttl_seconds=_TTL)
+        await store.create("a", status="pending")
+        (await store.get("a"))["status"] = "tampered"
+        assert (await store.get("a"))["status"] == "pending"
+
+
+    @pytest.mark.asyncio
+    async def test_running_job_outlives_the_terminal_ttl(self, clock):
+        store = InMemoryJobStore(ttl_seconds=_TTL, inflight_ttl_seconds=_INFLIGHT_TTL)
+        await store.create("a", status="pending", url="https://example.com")
+        await store.update("a", status="running")
+
+        clock[0] = _TTL + 1
+        assert (await store.get("a"))["status"] == "running"
+
+        clock[0] = _INFLIGHT_TTL + 1
+        assert await store.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_finished_job_is_evicted_after_the_ttl(self, clock):
+        store = InMemoryJobStore(ttl_seconds=_TTL, inflight_ttl_seconds=_INFLIGHT_TTL)
+        await store.create("a", status="pending")
+        clock[0] = 100
+        await store.finish("a", status="done")
+
+        clock[0] = 100 + _TTL - 1
+        assert (await store.get("a"))["status"] == "done"
+        clock[0] = 100 + _TTL + 1
+        assert await store.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_evicted_job_is_not_recreated(self, clock):
+        store = InMemoryJobStore(ttl_seconds=_TTL, inflight_ttl_seconds=_INFLIGHT_TTL)
+        await store.create("a", status="pending")
+        clock[0] = _INFLIGHT_TTL + 1
+
+        await store.update("a", status="running")
+        await store.finish("a", status="done")
+
+        assert await store.get("a") is None
+
+
+class TestRedisJobStore:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, redis_store):
+        await redis_store.create("a", status="pending", url="https://example.com")
+        await redis_store.update("a", status="running")
+        await redis_store.finish(
+            "a", status="done", chunks_ingested=3, failed=["https://example.com/x"]
+        )
+
+        assert await redis_store.get("a") == {
+            "status": "done",
+            "url": "https://example.com",
+            "chunks_ingested": 3,
+            "failed": ["https://example.com/x"],
+        }
+        assert await redis_store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_fields_are_stored_as_json(self, redis_store, fake_redis):
+        await redis_store.create("a", status="pending", chunks_ingested=3, failed=[])
+        assert await fake_redis.hgetall("job:a") == {
+            "status": '"pending"',
+            "chunks_ingested": "3",
+            "failed": "[]",
+        }
+
+    @pytest.mark.asyncio
+    async def test_inflight_jobs_expire(self, redis_store, fake_redis):
+        await redis_store.create("a", status="pending")
+        assert _TTL < await fake_redis.ttl("job:a") <= _INFLIGHT_TTL
+
+        await redis_store.update("a", status="running")
+        assert _TTL < await fake_redis.ttl("job:a") <= _INFLIGHT_TTL
+
+    @pytest.mark.asyncio
+    async def test_finish_sets_the_terminal_ttl(self, redis_store, fake_redis):
+        await redis_store.create("a", status="pending")
+        await redis_store.finish("a", status="error", error="boom")
+        assert 0 < await fake_redis.ttl("job:a") <= _TTL
+
+
+class TestCreateJobStore:
+    def test_in_memory_without_url(self):
+        assert isinstance(create_job_store(None, ttl_seconds=_TTL), InMemoryJobStore)
+
+    def test_redis_with_url(self, fake_redis):
+        store = create_job_store("redis://fake", ttl_seconds=_TTL)
+        assert isinstance(store, RedisJobStore)
@@ -0,0 +1,24 @@
+"""
+Guard against duplicate copies of CrawlPrime's entry-point modules.
+
+Older layouts shipped second copies of api.py / main.py / pipeline.py with
+the same public names (``app``, ``CrawlPrimePipeline``); whichever one the
+import system resolved first was served.  Each module must exist exactly
+once, inside the crawl_prime package.
+"""
+
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_PACKAGE = _REPO_ROOT / "src" / "crawl_prime"
+
+
+class TestNoDuplicateModules:
+    @pytest.mark.parametrize("name", ["api.py", "main.py", "pipeline.py", "planner.py"])
+    def test_single_copy_in_package(self, name):
+        copies = sorted((_REPO_ROOT / "src").rglob(name))
+        assert copies == [_PACKAGE / name], (
+            f"Expected exactly one {name} at {_PACKAGE / name}, found: {copies}"
+        )
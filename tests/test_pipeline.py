@@ -0,0 +1,266 @@
+"""
+Unit tests for CrawlPrimePipeline's own logic.
+
+Every ContextPrime component and the Qdrant admin client are replaced with
+mocks, so these tests exercise the pipeline's caching and error handling
+without Qdrant, Neo4j or an LLM.
+"""
+
+import asyncio
+import functools
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from cachetools import TTLCache
+from loguru import logger
+
+import crawl_prime.pipeline as pipeline_module
+from crawl_prime.pipeline import CrawlPrimePipeline, EmptyQueryResult
+
+_SERVICE_CLASSES = [
+    "QdrantClient",
+    "QdrantManager",
+    "DocumentIngestionPipeline",
+    "WebIngestionPipeline",
+    "HybridRetriever",
+    "AgenticPipeline",
+    "Neo4jManager",
+    "GraphQueryInterface",
+    "GraphIngestionManager",
+]
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch, tmp_path):
+    """Build CrawlPrimePipelines whose service clients are all mocks."""
+    for name in _SERVICE_CLASSES:
+        monkeypatch.setattr(pipeline_module, name, MagicMock())
+
+    def _make(**kwargs):
+        pipeline = CrawlPrimePipeline(storage_path=tmp_path, **kwargs)
+        pipeline._web_ingestion.ingest_url = AsyncMock(
+            return_value=SimpleNamespace(chunks_ingested=3, failed_documents=[])
+        )
+        pipeline._qdrant_admin.count.return_value = SimpleNamespace(count=5)
+        pipeline._agentic.process_query = AsyncMock(
+            side_effect=lambda text, **_: SimpleNamespace(answer=text, results=[])
+        )
+        return pipeline
+
+    return _make
+
+
+class TestIngest:
+    @pytest.mark.asyncio
+    async def test_quantization_failure_does_not_fail_ingest(self, make_pipeline):
+        admin = pipeline_module.QdrantClient.return_value
+        admin.update_collection.side_effect = RuntimeError("Qdrant unavailable")
+        pipeline = make_pipeline(quantization="int8")
+
+        report = await pipeline.ingest("https://example.com")
+
+        assert report.chunks_ingested == 3
+        assert not pipeline._quantization_applied
+
+    @pytest.mark.parametrize("mode, hnsw_m", [("binary", 32), ("int8", None)])
+    def test_only_binary_quantization_changes_hnsw(self, make_pipeline, mode, hnsw_m):
+        pipeline = make_pipeline(quantization=mode)
+
+        kwargs = pipeline._qdrant_admin.update_collection.call_args.kwargs
+        hnsw = kwargs["hnsw_config"]
+        assert (hnsw.m if hnsw is not None else None) == hnsw_m
+
+    @pytest.mark.asyncio
+    async def test_log_messages_include_their_arguments(self, make_pipeline):
+        messages = []
+        sink_id = logger.add(messages.append, format="{message}")
+        try:
+            pipeline = make_pipeline()
+            await pipeline.ingest("https://example.com")
+        finally:
+            logger.remove(sink_id)
+
+        assert "CrawlPrime ingesting: https://example.com\n" in messages
+        assert "Ingestion complete — 3 chunks stored, 0 failures\n" in messages
+
+
+class TestQueryCache:
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, make_pipeline):
+        pipeline = make_pipeline()
+
+        first = await pipeline.query("What is Acme?")
+        second = await pipeline.query("What is Acme?")
+
+        assert second is first
+        assert pipeline._agentic.process_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_key_ignores_case_and_whitespace(self, make_pipeline):
+        pipeline = make_pipeline()
+
+        await pipeline.query("What is Acme?")
+        await pipeline.query("  what IS\tacme? ")
+        assert pipeline._agentic.process_query.await_count == 1
+
+        await pipeline.query("What is Acme?", max_iterations=3)
+        assert pipeline._agentic.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, make_pipeline, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(
+            pipeline_module, "TTLCache", functools.partial(TTLCache, timer=lambda: now[0])
+        )
+        pipeline = make_pipeline(query_cache_ttl=60)
+
+        await pipeline.query("What is Acme?")
+        now[0] = 59
+        await pipeline.query("What is Acme?")
+        assert pipeline._agentic.process_query.await_count == 1
+
+        now[0] = 61
+        await pipeline.query("What is Acme?")
+        assert pipeline._agentic.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_size_zero_disables_cache(self, make_pipeline):
+        pipeline = make_pipeline(query_cache_size=0)
+
+        await pipeline.query("What is Acme?")
+        await pipeline.query("What is Acme?")
+        assert pipeline._agentic.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ingest_invalidates_cache(self, make_pipeline):
+        pipeline = make_pipeline()
+
+        await pipeline.query("What is Acme?")
+        await pipeline.ingest("https://example.com")
+        await pipeline.query("What is Acme?")
+
+        assert pipeline._agentic.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_ingest_invalidates_cache(self, make_pipeline):
+        pipeline = make_pipeline()
+        await pipeline.query("What is Acme?")
+
+        # The crawl may fail after part of the page was already stored.
+        pipeline._web_ingestion.ingest_url.side_effect = RuntimeError("crawl failed")
+        with pytest.raises(RuntimeError):
+            await pipeline.ingest("https://example.com")
+        await pipeline.query("What is Acme?")
+
+        assert pipeline._agentic.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_answer_computed_across_an_ingest_is_not_cached(self, make_pipeline):
+        pipeline = make_pipeline()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_query(text, **_):
+            started.set()
+            await release.wait()
+            return SimpleNamespace(answer="stale", results=[])
+
+        pipeline._agentic.process_query = AsyncMock(side_effect=slow_query)
+        in_flight = asyncio.create_task(pipeline.query("What is Acme?"))
+        await started.wait()
+        await pipeline.ingest("https://example.com")
+        release.set()
+        await in_flight
+
+        await pipeline.query("What is Acme?")
+        assert pipeline._agentic.process_query.await_count == 2
+
+
+class TestEmptyCollection:
+    @pytest.mark.asyncio
+    async def test_empty_collection_skips_the_agentic_pipeline(self, make_pipeline):
+        pipeline = make_pipeline()
+        pipeline._qdrant_admin.count.return_value = SimpleNamespace(count=0)
+
+        result = await pipeline.query("What is Acme?")
+
+        assert isinstance(result, EmptyQueryResult)
+        assert result.answer == "" and result.results == []
+        pipeline._agentic.process_query.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_counts_as_empty(self, make_pipeline):
+        pipeline = make_pipeline()
+        pipeline._qdrant_admin.collection_exists.return_value = False
+
+        assert isinstance(await pipeline.query("What is Acme?"), EmptyQueryResult)
+
+    @pytest.mark.asyncio
+    async def test_count_is_cached_between_queries(self, make_pipeline):
+        pipeline = make_pipeline()
+
+        await pipeline.query("What is Acme?")
+        await pipeline.query("Who runs Acme?")
+
+        assert pipeline._qdrant_admin.count.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_count_error_falls_through_to_normal_path(self, make_pipeline):
+        pipeline = make_pipeline()
+        pipeline._qdrant_admin.count.side_effect = RuntimeError("Qdrant down")
+
+        result = await pipeline.query("What is Acme?")
+        await pipeline.query("Who runs Acme?")
+
+        assert result.answer == "What is Acme?"
+        # A failed count is not cached; the next query asks again.
+        assert pipeline._qdrant_admin.count.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ingest_resets_the_count(self, make_pipeline):
+        pipeline = make_pipeline()
+        admin = pipeline._qdrant_admin
+        admin.count.return_value = SimpleNamespace(count=0)
+        assert isinstance(await pipeline.query("What is Acme?"), EmptyQueryResult)
+
+        admin.count.return_value = SimpleNamespace(count=5)
+        await pipeline.ingest("https://example.com")
+
+        assert (await pipeline.query("What is Acme?")).answer == "What is Acme?"
+
+    @pytest.mark.asyncio
+    async def test_failed_ingest_resets_the_count(self, make_pipeline):
+        pipeline = make_pipeline()
+        admin = pipeline._qdrant_admin
+        admin.count.return_value = SimpleNamespace(count=0)
+        assert isinstance(await pipeline.query("What is Acme?"), EmptyQueryResult)
+
+        admin.count.return_value = SimpleNamespace(count=5)
+        pipeline._web_ingestion.ingest_url.side_effect = RuntimeError("crawl failed")
+        with pytest.raises(RuntimeError):
+            await pipeline.ingest("https://example.com")
+
+        assert (await pipeline.query("What is Acme?")).answer == "What is Acme?"
+
+    @pytest.mark.asyncio
+    async def test_count_read_across_an_ingest_is_not_cached(self, make_pipeline):
+        pipeline = make_pipeline()
+        admin = pipeline._qdrant_admin
+        started, release = threading.Event(), threading.Event()
+
+        def slow_count(**_):
+            started.set()
+            release.wait()
+            return SimpleNamespace(count=0)
+
+        admin.count.side_effect = slow_count
+        in_flight = asyncio.create_task(pipeline.query("What is Acme?"))
+        await asyncio.to_thread(started.wait)
+        await pipeline.ingest("https://example.com")
+        release.set()
+        await in_flight
+
+        admin.count.side_effect = None
+        admin.count.return_value = SimpleNamespace(count=5)
+        assert (await pipeline.query("What is Acme?")).answer == "What is Acme?"
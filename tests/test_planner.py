@@ -0,0 +1,122 @@
+"""
+Unit tests for CrawlPrime's URL-aware planner.
+
+Exercises prepend_web_ingestion_step() against ContextPrime's PlanStep /
+StepType so the WEB_INGESTION step and the renumbered DAG stay consistent.
+"""
+
+import pytest
+from contextprime.agents.planning_agent import PlanStep, StepType
+from crawl_prime.planner import (
+    WebStepType,
+    extract_urls,
+    prepend_web_ingestion_step,
+)
+
+
+def _step(n, step_type=StepType.RETRIEVAL, deps=()):
+    return PlanStep(
+        step_id=f"step_{n}",
+        step_type=step_type,
+        description=f"step {n}",
+        parameters={},
+        dependencies=list(deps),
+    )
+
+
+class TestUrlDetection:
+    def test_query_without_url_is_unchanged(self):
+        steps = [_step(0)]
+        out, web_step_id = prepend_web_ingestion_step("What is Acme?", steps)
+        assert web_step_id is None
+        assert out is steps
+
+    @pytest.mark.parametrize("query, expected", [
+        ("see https://example.com.", "https://example.com"),
+        ("(https://example.com/docs), then", "https://example.com/docs"),
+        ("<https://example.com/a?b=1&c=2>", "https://example.com/a?b=1&c=2"),
+        ("url 'http://example.com/x'", "http://example.com/x"),
+        ("is https://example.com/faq?", "https://example.com/faq"),
+    ])
+    def test_url_is_extracted_without_surrounding_punctuation(self, query, expected):
+        out, _ = prepend_web_ingestion_step(query, [_step(0)])
+        assert out[0].parameters["url"] == expected
+
+
+class TestRenumbering:
+    def test_web_step_is_prepended_and_dependencies_remapped(self):
+        steps = [
+            _step(0),
+            _step(1, StepType.ANALYSIS, ["step_0"]),
+            _step(2, StepType.SYNTHESIS, ["step_1", "step_0"]),
+        ]
+        out, web_step_id = prepend_web_ingestion_step(
+            "Summarise https://example.com", steps
+        )
+
+        assert web_step_id == "step_0"
+        assert out[0].step_type == WebStepType.WEB_INGESTION
+        assert [s.step_id for s in out] == ["step_0", "step_1", "step_2", "step_3"]
+        assert [s.dependencies for s in out] == [
+            [], ["step_0"], ["step_1"], ["step_2", "step_1"],
+        ]
+
+    def test_foreign_ids_are_renumbered_by_their_suffix(self):
+        steps = [
+            PlanStep(
+                step_id="retrieve_1",
+                step_type=StepType.RETRIEVAL,
+                description="retrieve",
+                parameters={},
+                dependencies=[],
+            ),
+            _step(2, StepType.ANALYSIS, ["retrieve_1", "step_7"]),
+        ]
+        out, _ = prepend_web_ingestion_step("Summarise https://example.com", steps)
+
+        assert [s.step_id for s in out] == ["step_0", "step_2", "step_3"]
+        assert out[2].dependencies == ["step_2", "step_8"]
+
+    def test_id_without_numeric_suffix_is_rejected(self):
+        steps = [_step(0), _step(1, StepType.ANALYSIS, ["retrieval"])]
+        with pytest.raises(ValueError, match="'retrieval'"):
+            prepend_web_ingestion_step("Summarise https://example.com", steps)
+
+    def test_steps_are_emitted_in_dependency_order(self):
+        steps = [
+            _step(0, StepType.SYNTHESIS, ["step_2"]),
+            _step(1),
+            _step(2, StepType.ANALYSIS, ["step_1"]),
+        ]
+        out, _ = prepend_web_ingestion_step("Summarise https://example.com", steps)
+
+        assert [s.step_id for s in out] == ["step_0", "step_2", "step_3", "step_1"]
+        emitted = set()
+        for step in out:
+            assert set(step.dependencies) <= emitted
+            emitted.add(step.step_id)
+
+
+class TestExtractUrls:
+    def test_urls_are_mapped_back_to_their_query(self):
+        queries = [
+            "compare https://a.example.com and http://b.example.com/x.",
+            "no links here",
+            "",
+            "(https://c.example.com/docs?q=1)",
+        ]
+        assert extract_urls(queries) == [
+            ["https://a.example.com", "http://b.example.com/x"],
+            [],
+            [],
+            ["https://c.example.com/docs?q=1"],
+        ]
+
+    def test_url_at_end_of_query_does_not_run_into_the_next(self):
+        assert extract_urls(["see https://a.example.com", "https://b.example.com"]) == [
+            ["https://a.example.com"],
+            ["https://b.example.com"],
+        ]
+
+    def test_empty_batch(self):
+        assert extract_urls([]) == []
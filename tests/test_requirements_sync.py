@@ -0,0 +1,40 @@
+"""
+Guard that requirements.txt covers pyproject.toml's dependencies.
+
+The dev-mode install (README, Option B) installs CrawlPrime with
+``--no-deps``, so requirements.txt is the only dependency list it sees.
+ContextPrime is the exception: that path installs it from the sibling
+checkout.
+"""
+
+import re
+import tomllib
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_NAME_RE = re.compile(r"^\s*([A-Za-z0-9_.-]+)")
+
+
+def _name(requirement: str) -> str:
+    return _NAME_RE.match(requirement).group(1).lower().replace("_", "-")
+
+
+def _pyproject_dependencies() -> list:
+    with open(_REPO_ROOT / "pyproject.toml", "rb") as f:
+        deps = tomllib.load(f)["project"]["dependencies"]
+    return sorted(_name(d) for d in deps if _name(d) != "contextprime")
+
+
+def _requirements() -> set:
+    lines = (_REPO_ROOT / "requirements.txt").read_text().splitlines()
+    return {_name(line) for line in lines if line.strip() and not line.lstrip().startswith("#")}
+
+
+class TestRequirementsSync:
+    @pytest.mark.parametrize("name", _pyproject_dependencies())
+    def test_dependency_listed_in_requirements(self, name):
+        assert name in _requirements(), (
+            f"{name} is a pyproject.toml dependency but missing from requirements.txt"
+        )
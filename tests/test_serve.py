@@ -0,0 +1,53 @@
+"""
+Unit tests for the production entry point's worker-count handling.
+"""
+
+import sys
+
+import pytest
+
+from crawl_prime import serve
+
+
+@pytest.fixture
+def run_serve(monkeypatch):
+    """Run serve.main() with the given argv; return uvicorn.run's kwargs."""
+    for name in ("REDIS_URL", "WEB_CONCURRENCY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(serve.os, "cpu_count", lambda: 8)
+    calls = []
+    monkeypatch.setattr(serve.uvicorn, "run", lambda app, **kw: calls.append(kw))
+
+    def _run(*argv):
+        monkeypatch.setattr(sys, "argv", ["crawl_prime.serve", *argv])
+        serve.main()
+        return calls[-1]
+
+    return _run
+
+
+class TestWorkers:
+    def test_single_worker_without_redis(self, run_serve):
+        assert run_serve()["workers"] == 1
+
+    def test_one_worker_per_cpu_with_redis(self, run_serve, monkeypatch):
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+        assert run_serve()["workers"] == 8
+
+    def test_web_concurrency_overrides_default(self, run_serve, monkeypatch):
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+        monkeypatch.setenv("WEB_CONCURRENCY", "3")
+        assert run_serve()["workers"] == 3
+
+    @pytest.mark.parametrize("argv, env", [
+        (["--workers", "2"], {}),
+        ([], {"WEB_CONCURRENCY": "4"}),
+    ])
+    def test_multiple_workers_without_redis_are_refused(
+        self, run_serve, monkeypatch, argv, env
+    ):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        with pytest.raises(SystemExit) as excinfo:
+            run_serve(*argv)
+        assert excinfo.value.code == 2